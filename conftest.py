@@ -0,0 +1 @@
+"""Let pytest import ev3devlight from the repository root."""
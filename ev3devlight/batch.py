@@ -0,0 +1,108 @@
+"""Module to simulate a program many times with different parameters.
+
+This runs on a PC only, not on the EV3 brick.
+
+A program is a function that takes a dictionary of parameters, sets up
+motors and other devices, and returns a control function. The control
+function is called once per time step with the simulated time. It must not
+block or sleep, so use go_to(..., wait=False) instead of waiting. It may
+return a dictionary of values to record, or None.
+
+For example:
+
+    def program(params):
+        base = DriveBase('outB', 'outC', 4.3, 12,
+                         max_speed=params['max_speed'])
+
+        def control(time):
+            base.drive_and_turn(50, 0)
+            return {'left': base.left_motor.position}
+        return control
+
+    rows = sweep(program, parameter_grid(max_speed=[20, 40, 60]), 2)
+
+The program must be defined at module level so that it can be sent to the
+worker processes. On Windows and macOS, call sweep from within an
+if __name__ == '__main__': block.
+"""
+from itertools import product
+from multiprocessing import Pool
+from os import chdir, getcwd
+from shutil import rmtree
+from tempfile import mkdtemp
+from .virtualhardware import make_files, VirtualHardware
+
+
+def parameter_grid(**values):
+    """Return a list of parameter dictionaries for every combination.
+
+    Example usage:
+    parameter_grid(max_speed=[20, 40], gain=[1, 2])
+
+    This returns 4 dictionaries, such as {'max_speed': 20, 'gain': 2}.
+    """
+    names = list(values)
+    return [dict(zip(names, combination))
+            for combination in product(*values.values())]
+
+
+def simulate(program, params, duration, step_time=0.01, **motor_options):
+    """Run a program once on its own virtual hardware.
+
+    Return the list of recorded values. Each entry is the dictionary
+    returned by the control function, along with the simulated time.
+    """
+    # Every run gets a fresh set of dummy hardware files in its own folder
+    original_dir = getcwd()
+    run_dir = mkdtemp(prefix='ev3devlight-')
+    chdir(run_dir)
+    try:
+        make_files()
+        hardware = VirtualHardware(step_time, **motor_options)
+        control = program(params)
+        telemetry = []
+        while hardware.time < duration:
+            values = control(hardware.time)
+            if values is not None:
+                record = {'time': hardware.time}
+                record.update(values)
+                telemetry.append(record)
+            hardware.step()
+        return telemetry
+    finally:
+        chdir(original_dir)
+        rmtree(run_dir)
+
+
+def last_values(telemetry):
+    """Summarize a run by the last recorded values."""
+    return dict(telemetry[-1]) if telemetry else {}
+
+
+def run_task(task):
+    """Simulate one parameter set and summarize it. Used by sweep."""
+    program, params, duration, step_time, summarize, motor_options = task
+    telemetry = simulate(program, params, duration, step_time,
+                         **motor_options)
+    row = dict(params)
+    row.update(summarize(telemetry))
+    row['telemetry'] = telemetry
+    return row
+
+
+def sweep(program, grid, duration, step_time=0.01, summarize=last_values,
+          processes=None, **motor_options):
+    """Simulate a program for every parameter set, in parallel.
+
+    The grid is a list of parameter dictionaries, such as those made by
+    parameter_grid. The summarize function turns the recorded values of
+    one run into a dictionary of metrics.
+
+    Return one row per parameter set, in the same order as the grid. Each
+    row is a dictionary with the parameters, the metrics, and the full
+    list of recorded values under 'telemetry'.
+    """
+    tasks = [(program, params, duration, step_time, summarize, motor_options)
+             for params in grid]
+    with Pool(processes) as pool:
+        return pool.map(run_task, tasks)
@@ -1,11 +1,109 @@
 """Module for EV3 Brick Buttons, LEDS, and Display."""
 from sys import stderr
-from .fileio import read_int, get_battery_path
+from time import sleep
+from _thread import start_new_thread, allocate_lock
+from .fileio import (read_int, read_str, get_battery_path,
+                     get_framebuffer_path, get_graphics_path)
+
+try:
+    from mmap import mmap
+except ImportError:
+    # MicroPython has no mmap, so the display writes rows to the file instead
+    mmap = None
+
+try:
+    from atexit import register as at_exit
+except ImportError:
+    # MicroPython has no atexit, so call flush() before the program ends
+    at_exit = None
+
+
+class LogSink():
+    """Print messages from a background thread.
+
+    log() takes the same arguments as print, but only stores them in a
+    bounded queue and returns right away. A background thread converts them
+    to text and writes them to the output file. If the queue is full, the
+    message is dropped and counted in dropped. A message that cannot be
+    written, for example because converting it to text fails, is skipped
+    and counted in failed.
+
+    Because messages are converted to text later, pass values rather than
+    objects that the program is still changing.
+    """
+
+    def __init__(self, file=stderr, max_messages=100, period=0.01):
+        """Start the background thread that writes messages to file."""
+        self.file = file
+        self.max_messages = max_messages
+        self.period = period
+        self.messages = []
+        self.dropped = 0
+        self.failed = 0
+        self.queue_lock = allocate_lock()
+        self.write_lock = allocate_lock()
+        start_new_thread(self.run, ())
+        if at_exit is not None:
+            at_exit(self.flush)
+
+    def log(self, *args, **kwargs):
+        """Queue a message without waiting for it to be written."""
+        with self.queue_lock:
+            if len(self.messages) < self.max_messages:
+                self.messages.append((args, kwargs))
+            else:
+                self.dropped += 1
+
+    def flush(self):
+        """Write all queued messages now."""
+        # Hold the write lock while taking messages from the queue, so that
+        # batches are written in the order in which they were taken
+        with self.write_lock:
+            # Take all queued messages at once, so log() is never kept waiting
+            with self.queue_lock:
+                messages = self.messages
+                self.messages = []
+            for args, kwargs in messages:
+                # Skip a bad message instead of stopping the writer
+                try:
+                    print(*args, file=self.file, **kwargs)
+                except Exception:
+                    self.failed += 1
+            if messages:
+                try:
+                    self.file.flush()
+                except Exception:
+                    # Keep going. The next flush will try again.
+                    pass
+
+    def run(self):
+        """Keep writing queued messages."""
+        while True:
+            self.flush()
+            sleep(self.period)
+
+
+# Sink used by print_vscode. None means print_vscode prints directly.
+vscode_sink = None
+
+
+def buffer_print_vscode(max_messages=100):
+    """Make print_vscode return right away and print in the background.
+
+    Return the LogSink, so you can check how many messages were dropped.
+    """
+    global vscode_sink
+    if vscode_sink is None:
+        vscode_sink = LogSink(stderr, max_messages)
+    return vscode_sink
 
 
 def print_vscode(*args, **kwargs):
     """Print a message to standard error so it displays in the vscode IDE."""
-    print(*args, file=stderr, **kwargs)
+    if vscode_sink is None:
+        print(*args, file=stderr, **kwargs)
+    else:
+        vscode_sink.log(*args, **kwargs)
 
 
 def print_display(*args, **kwargs):
@@ -25,5 +123,232 @@ class Battery():
     def voltage(self):
         """Return battery voltage."""
         return read_int(self.voltage_file) / 1e6
-    
+
+
+# 3x5 pixel font. Each glyph is 5 rows of 3 bits, top row first, with the
+# most significant bit of each row on the left.
+FONT = {
+    '0': 0x7B6F, '1': 0x2C97, '2': 0x73E7, '3': 0x73CF, '4': 0x5BC9,
+    '5': 0x79CF, '6': 0x79EF, '7': 0x7249, '8': 0x7BEF, '9': 0x7BCF,
+    'A': 0x2BED, 'B': 0x6BAE, 'C': 0x3923, 'D': 0x6B6E, 'E': 0x79A7,
+    'F': 0x79A4, 'G': 0x396B, 'H': 0x5BED, 'I': 0x7497, 'J': 0x126A,
+    'K': 0x5BAD, 'L': 0x4927, 'M': 0x5FED, 'N': 0x6B6D, 'O': 0x2B6A,
+    'P': 0x6BA4, 'Q': 0x2B73, 'R': 0x6BAD, 'S': 0x388E, 'T': 0x7492,
+    'U': 0x5B6F, 'V': 0x5B6A, 'W': 0x5BFD, 'X': 0x5AAD, 'Y': 0x5A92,
+    'Z': 0x72A7, ' ': 0x0000, '.': 0x0002, ',': 0x0014, ':': 0x0410,
+    '-': 0x01C0, '+': 0x05D0, '=': 0x0E38, '/': 0x12A4, '%': 0x52A5,
+    '(': 0x1491, ')': 0x4494, '_': 0x0007, '!': 0x2482, '?': 0x6282,
+    '<': 0x1511, '>': 0x4454, '*': 0x0AA8, '#': 0x5F7D, "'": 0x2400,
+    '"': 0x5A00, '[': 0x3493, ']': 0x6496,
+}
+FONT_WIDTH = 3
+FONT_HEIGHT = 5
+
+
+class Display():
+    """Draw on the EV3 screen through the framebuffer.
+
+    All drawing goes to an off-screen buffer. Nothing is shown until
+    refresh() is called, which copies only the rows that changed since the
+    previous refresh. This makes it cheap to update a status line on every
+    pass through a control loop.
+
+    On a PC, the framebuffer is a plain file made by make_files(). Use
+    save_pbm() to view what would be on the screen.
+    """
+
+    def __init__(self):
+        """Open the framebuffer and read its geometry."""
+        # Read the screen geometry
+        path = get_graphics_path()
+        with open(path + 'virtual_size', 'rb') as f:
+            size = read_str(f).split(',')
+            self.width = int(size[0])
+            self.height = int(size[1])
+        with open(path + 'bits_per_pixel', 'rb') as f:
+            self.bits_per_pixel = read_int(f)
+        with open(path + 'stride', 'rb') as f:
+            self.stride = read_int(f)
+        self.bytes_per_pixel = self.bits_per_pixel // 8
+
+        # Open the framebuffer, and map it into memory if we can
+        self.framebuffer_file = open(get_framebuffer_path(), 'r+b')
+        size = self.stride * self.height
+        if mmap is not None:
+            self.framebuffer = mmap(self.framebuffer_file.fileno(), size)
+        else:
+            self.framebuffer = None
+
+        # The off-screen buffer that all drawing goes to
+        self.buffer = bytearray(size)
+        self.buffer_view = memoryview(self.buffer)
+
+        # One white and one black row, copied in slices to fill quickly
+        white = 0 if self.bits_per_pixel == 1 else 0xFF
+        self.white_row = memoryview(bytes([white]) * self.stride)
+        self.black_row = memoryview(bytes([0xFF - white]) * self.stride)
+
+        # Rows that changed since the last refresh
+        self.dirty_top = 0
+        self.dirty_bottom = self.height - 1
+
+        # Blank the screen once so the buffer matches what is displayed
+        self.clear()
+        self.refresh()
+
+    def mark_dirty(self, top, bottom):
+        """Include rows top up to and including bottom in the next refresh."""
+        if top < self.dirty_top:
+            self.dirty_top = top
+        if bottom > self.dirty_bottom:
+            self.dirty_bottom = bottom
+
+    def refresh(self):
+        """Copy the rows that changed since the last refresh to the screen."""
+        top = max(self.dirty_top, 0)
+        bottom = min(self.dirty_bottom, self.height - 1)
+        if top <= bottom:
+            start = top * self.stride
+            end = (bottom + 1) * self.stride
+            if self.framebuffer is not None:
+                self.framebuffer[start:end] = self.buffer_view[start:end]
+            else:
+                self.framebuffer_file.seek(start)
+                self.framebuffer_file.write(self.buffer_view[start:end])
+                self.framebuffer_file.flush()
+        # Nothing is dirty anymore
+        self.dirty_top = self.height
+        self.dirty_bottom = -1
+
+    def clear(self):
+        """Make the whole screen white."""
+        for y in range(self.height):
+            start = y * self.stride
+            self.buffer_view[start:start + self.stride] = self.white_row
+        self.mark_dirty(0, self.height - 1)
+
+    def span(self, x, y, length, black=True):
+        """Fill a horizontal run of pixels, clipped to the screen.
+
+        This only changes the buffer. The caller marks the rows dirty.
+        """
+        if not 0 <= y < self.height:
+            return
+        start = max(x, 0)
+        end = min(x + length, self.width)
+        if start >= end:
+            return
+        row = self.black_row if black else self.white_row
+        base = y * self.stride
+        if self.bits_per_pixel == 1:
+            # One bit per pixel, least significant bit first, 1 is black.
+            # Set single bits up to a byte boundary, then copy whole bytes.
+            aligned = min((start + 7) // 8 * 8, end)
+            self.set_bits(base, start, aligned, black)
+            count = (end - aligned) // 8
+            index = base + aligned // 8
+            self.buffer_view[index:index + count] = row[:count]
+            self.set_bits(base, aligned + count * 8, end, black)
+        else:
+            # Every color byte is either fully on (white) or off (black)
+            index = base + start * self.bytes_per_pixel
+            count = (end - start) * self.bytes_per_pixel
+            self.buffer_view[index:index + count] = row[:count]
+
+    def set_bits(self, base, start, end, black):
+        """Set or clear pixels start up to end in a 1 bit per pixel row."""
+        for x in range(start, end):
+            if black:
+                self.buffer[base + x // 8] |= 1 << (x % 8)
+            else:
+                self.buffer[base + x // 8] &= ~(1 << (x % 8)) & 0xFF
+
+    def set_pixel(self, x, y, black=True):
+        """Make one pixel black or white. Pixels off the screen are ignored."""
+        self.span(x, y, 1, black)
+        self.mark_dirty(y, y)
+
+    def get_pixel(self, x, y):
+        """Return True if the pixel in the off-screen buffer is black."""
+        if self.bits_per_pixel == 1:
+            return bool(self.buffer[y * self.stride + x // 8] & 1 << (x % 8))
+        else:
+            return self.buffer[y * self.stride + x * self.bytes_per_pixel] == 0
+
+    def rectangle(self, x, y, width, height, fill=True, black=True):
+        """Draw a filled or outlined rectangle with its top left at x, y."""
+        for row in range(y, y + height):
+            if fill or row == y or row == y + height - 1:
+                self.span(x, row, width, black)
+            else:
+                self.span(x, row, 1, black)
+                self.span(x + width - 1, row, 1, black)
+        self.mark_dirty(y, y + height - 1)
+
+    def line(self, x1, y1, x2, y2, black=True):
+        """Draw a straight line between two points."""
+        # Bresenham's line algorithm
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        step_x = 1 if x1 < x2 else -1
+        step_y = 1 if y1 < y2 else -1
+        error = dx + dy
+        self.mark_dirty(min(y1, y2), max(y1, y2))
+        while True:
+            self.span(x1, y1, 1, black)
+            if x1 == x2 and y1 == y2:
+                break
+            double_error = 2 * error
+            if double_error >= dy:
+                error += dy
+                x1 += step_x
+            if double_error <= dx:
+                error += dx
+                y1 += step_y
+
+    def text(self, x, y, text, scale=1):
+        """Draw text with its top left at x, y.
+
+        The background of each character is made white first, so new text
+        can be drawn over old text on the same line. Lower case letters are
+        shown as upper case, and unknown characters as a question mark.
+        """
+        cell_width = (FONT_WIDTH + 1) * scale
+        cell_height = (FONT_HEIGHT + 1) * scale
+        self.mark_dirty(y, y + cell_height - 1)
+        for char in str(text).upper():
+            glyph = FONT.get(char, FONT['?'])
+            # White background for the whole character cell
+            for row in range(y, y + cell_height):
+                self.span(x, row, cell_width, False)
+            for row in range(FONT_HEIGHT):
+                for col in range(FONT_WIDTH):
+                    bit = 1 << ((FONT_HEIGHT - 1 - row) * FONT_WIDTH +
+                                FONT_WIDTH - 1 - col)
+                    if glyph & bit:
+                        top = y + row * scale
+                        for pixel_row in range(top, top + scale):
+                            self.span(x + col * scale, pixel_row, scale)
+            x += cell_width
+
+    def status(self, line, text, scale=1):
+        """Replace a full line of text, counted from the top of the screen."""
+        cell_height = (FONT_HEIGHT + 1) * scale
+        y = line * cell_height
+        self.rectangle(0, y, self.width, cell_height, black=False)
+        self.text(0, y, text, scale)
+
+    def save_pbm(self, file_name):
+        """Save the off-screen buffer as a black and white PBM image."""
+        row_bytes = (self.width + 7) // 8
+        data = bytearray(row_bytes * self.height)
+        for y in range(self.height):
+            for x in range(self.width):
+                if self.get_pixel(x, y):
+                    data[y * row_bytes + x // 8] |= 0x80 >> (x % 8)
+        with open(file_name, 'wb') as image:
+            header = 'P4\n{0} {1}\n'.format(self.width, self.height)
+            image.write(header.encode())
+            image.write(data)
+
 # TODO: Set LEDS
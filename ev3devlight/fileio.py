@@ -5,12 +5,64 @@ from os import listdir
 def real_robot():
     """Check if program is being executed on an ev3dev device."""
     # Checking for a fixed file unique to ev3dev might be faster.
-    if 'lego-sensor' in listdir('/sys/class/'):
-        return True
-    else:
+    try:
+        return 'lego-sensor' in listdir('/sys/class/')
+    except OSError:
+        # There is no /sys/class on Windows and macOS
         return False
 
 
+# Check once, since this does not change while the program runs
+ON_ROBOT = real_robot()
+
+
+class VirtualFile():
+    """Regular file that behaves like a sysfs attribute file.
+
+    Every write replaces the contents of the file, instead of being
+    appended to what was written before. Strings are encoded, so the same
+    file can be used for reading and writing.
+    """
+
+    def __init__(self, path):
+        """Open the file for unbuffered reading and writing."""
+        self.file = open(path, 'r+b', buffering=0)
+
+    def read(self):
+        """Read from the current position to the end of the file."""
+        return self.file.read()
+
+    def seek(self, offset):
+        """Move to a position in the file."""
+        self.file.seek(offset)
+
+    def write(self, value):
+        """Replace the file contents with value."""
+        if isinstance(value, str):
+            value = value.encode()
+        self.file.seek(0)
+        self.file.truncate()
+        self.file.write(value)
+
+    def flush(self):
+        """Do nothing. The file is unbuffered."""
+        pass
+
+
+def open_device_file(path, mode):
+    """Open a device file that stays open for fast reading and writing.
+
+    On a PC, the dummy file is opened as a VirtualFile so that it can be
+    written to repeatedly, just like the real sysfs file. The mode is only
+    used on the robot. A VirtualFile is always opened for reading and
+    writing.
+    """
+    if ON_ROBOT:
+        return open(path, mode)
+    else:
+        return VirtualFile(path)
+
+
 def read_int(infile):
     """Read an integer from a previously opened file descriptor."""
     infile.seek(0)
@@ -36,7 +88,7 @@ def write_str(outfile, value):
 
 
 # Preconverted dutyvalue strings
-duty_int2str = [str(i) for i in range(-100, 101)]
+duty_int2str = tuple(str(i) for i in range(-100, 101))
 
 
 def write_duty(dutyfile, value):
@@ -48,12 +100,28 @@ def write_duty(dutyfile, value):
 
 def get_battery_path():
     """Locate the battery path."""
-    if real_robot():
+    if ON_ROBOT:
         return '/sys/class/power_supply/lego-ev3-battery/'
     else:
         return 'hardware/power_supply/lego-ev3-battery/'
 
 
+def get_framebuffer_path():
+    """Locate the display framebuffer device."""
+    if ON_ROBOT:
+        return '/dev/fb0'
+    else:
+        return 'hardware/fb0'
+
+
+def get_graphics_path():
+    """Locate the folder that describes the framebuffer geometry."""
+    if ON_ROBOT:
+        return '/sys/class/graphics/fb0/'
+    else:
+        return 'hardware/graphics/fb0/'
+
+
 def get_sensor_or_motor_path(device_type, port):
     """Get a path to a device based on port name.
 
@@ -65,7 +133,7 @@ def get_sensor_or_motor_path(device_type, port):
     /sys/class/tacho-motor/motor2
 
     """
-    if real_robot():
+    if ON_ROBOT:
         base_dir = '/sys/class/' + device_type
     else:
         base_dir = 'hardware/' + device_type
@@ -0,0 +1,276 @@
+"""Module to measure how fast motors respond to commands.
+
+Each trial applies a step input with Motor.run or Motor.duty, and records
+the time from the write until the position and the speed readings first
+change.
+
+The speed lag is how far the speed estimate trails the actual speed. If
+the speed reading lags by L seconds, then once the motor runs at a steady
+speed, the position has moved steady speed * L degrees further than the
+integral of the speed readings. The lag is found from that difference.
+
+Run it as a script to print a report for all attached motors:
+
+    micropython -m ev3devlight.latency
+
+On a PC, it runs on the simulated motors of VirtualHardware instead. The
+times are then in simulated seconds. The simulator applies commands right
+away, so the response times are always one time step, and only show that
+the measurement works. The speed lag does reflect the averaging window of
+the simulated speed estimate.
+"""
+from time import sleep
+from .motors import Motor
+from .fileio import write_str
+
+try:
+    from time import perf_counter
+except ImportError:
+    # MicroPython has no perf_counter, but it has a microsecond counter
+    from time import ticks_us, ticks_diff
+
+    def clock():
+        """Return the time in microseconds, for use with elapsed."""
+        return ticks_us()
+
+    def elapsed(start):
+        """Return the seconds since start."""
+        return ticks_diff(ticks_us(), start) / 1e6
+else:
+    def clock():
+        """Return the time in seconds, for use with elapsed."""
+        return perf_counter()
+
+    def elapsed(start):
+        """Return the seconds since start."""
+        return perf_counter() - start
+
+
+class SimulatedClock():
+    """Time and waiting functions that step a VirtualHardware instead."""
+
+    def __init__(self, hardware):
+        """Use the time of the given VirtualHardware."""
+        self.hardware = hardware
+
+    def clock(self):
+        """Return the simulated time in seconds."""
+        return self.hardware.time
+
+    def elapsed(self, start):
+        """Return the simulated seconds since start."""
+        return self.hardware.time - start
+
+    def poll(self):
+        """Advance the simulation by one step between readings."""
+        self.hardware.step()
+
+    def sleep(self, duration):
+        """Advance the simulation by the given number of seconds."""
+        start = self.hardware.time
+        while self.hardware.time - start < duration:
+            self.hardware.step()
+
+
+class WallClock():
+    """Time and waiting functions for real motors."""
+
+    def clock(self):
+        """Return a high resolution timestamp."""
+        return clock()
+
+    def elapsed(self, start):
+        """Return the seconds since start."""
+        return elapsed(start)
+
+    def poll(self):
+        """Read again right away."""
+        pass
+
+    def sleep(self, duration):
+        """Wait for the given number of seconds."""
+        sleep(duration)
+
+
+def wait_until_still(motor, timer, still_time, timeout):
+    """Wait until the motor has been still for still_time seconds.
+
+    The motor is still when its speed reads 0 and its position does not
+    change. Return False if that does not happen within the timeout.
+    """
+    start = timer.clock()
+    position = motor.position
+    still_start = 0
+    while True:
+        timer.sleep(0.01)
+        now = timer.elapsed(start)
+        new_position = motor.position
+        if motor.speed != 0 or new_position != position:
+            # Still moving, so start counting again
+            position = new_position
+            still_start = now
+        elif now - still_start >= still_time:
+            return True
+        if now >= timeout:
+            return False
+
+
+def step_response(motor, command, level, timer, duration):
+    """Apply one step input and time the response.
+
+    Return the duration of the write, the times from the end of the write
+    until the position and the speed first change, and the speed lag. A
+    value is None if it could not be measured within the duration. The
+    duration must be long enough for the motor to reach a steady speed.
+    """
+    start_position = motor.position
+    start_speed = motor.speed
+
+    # Timestamp the write itself
+    start = timer.clock()
+    command(level)
+    write_time = timer.elapsed(start)
+
+    # Poll for the whole duration, integrating the speed readings
+    start = timer.clock()
+    position_time = None
+    speed_time = None
+    speed_integral = 0
+    previous_time = 0
+    previous_speed = start_speed
+    middle_time = None
+    while True:
+        timer.poll()
+        now = timer.elapsed(start)
+        position = motor.position
+        speed = motor.speed
+        if position_time is None and position != start_position:
+            position_time = now
+        if speed_time is None and speed != start_speed:
+            speed_time = now
+
+        # The program sees each speed reading until the next one
+        speed_integral += previous_speed * (now - previous_time)
+        previous_time = now
+        previous_speed = speed
+
+        # Remember the position near the end, to find the steady speed
+        if middle_time is None and now >= 0.8 * duration:
+            middle_time = now
+            middle_position = position
+        if now >= duration:
+            break
+
+    # Compare the distance travelled with the integral of the speed
+    speed_lag = None
+    if middle_time is not None and now > middle_time:
+        steady_speed = (position - middle_position) / (now - middle_time)
+        if steady_speed != 0:
+            distance = position - start_position
+            speed_lag = (distance - speed_integral) / steady_speed
+    return write_time, position_time, speed_time, speed_lag
+
+
+def statistics(values):
+    """Summarize a list of times, ignoring missing (None) values."""
+    found = sorted(value for value in values if value is not None)
+    summary = {'count': len(found), 'missed': len(values) - len(found)}
+    if found:
+        summary['min'] = found[0]
+        middle = len(found) // 2
+        if len(found) % 2:
+            summary['median'] = found[middle]
+        else:
+            summary['median'] = (found[middle - 1] + found[middle]) / 2
+        summary['mean'] = sum(found) / len(found)
+        summary['max'] = found[-1]
+    return summary
+
+
+def characterize(motor, timer, trials=20, speed=500, duty=50, duration=0.5,
+                 still_time=0.2, settle_timeout=3):
+    """Measure the response of a motor to run and duty steps.
+
+    Each trial waits until the motor is still, and then applies a step in
+    the opposite direction of the previous one. A trial where the motor
+    does not come to rest within settle_timeout is counted as missed.
+    Return a dictionary with the statistics of the write time, the
+    position and speed response times, and the speed lag, for both run
+    and duty steps.
+    """
+    # Brake between trials, so the motor comes to rest sooner
+    with open(motor.path + '/stop_action', 'w') as stop_action_file:
+        write_str(stop_action_file, 'brake')
+
+    results = {}
+    for name, level in (('run', speed), ('duty', duty)):
+        times = {'write': [], 'position': [], 'speed': [], 'speed_lag': []}
+        for trial in range(trials):
+            # Come to rest, in the mode that the step will be applied in
+            if name == 'run':
+                motor.stop()
+                command = motor.run
+            else:
+                motor.duty(0)
+                motor.activate_duty_mode()
+                command = motor.duty
+            if not wait_until_still(motor, timer, still_time,
+                                    settle_timeout):
+                for values in times.values():
+                    values.append(None)
+                continue
+
+            # Apply the step, alternating its direction
+            sign = 1 if trial % 2 == 0 else -1
+            response = step_response(motor, command, sign * level, timer,
+                                     duration)
+            for key, value in zip(('write', 'position', 'speed', 'speed_lag'),
+                                  response):
+                times[key].append(value)
+        motor.stop()
+        results[name] = {key: statistics(values)
+                         for key, values in times.items()}
+
+    # Restore the default stop action
+    with open(motor.path + '/stop_action', 'w') as stop_action_file:
+        write_str(stop_action_file, 'coast')
+    return results
+
+
+def print_results(port, results):
+    """Print the statistics of one motor in milliseconds."""
+    print('Motor ' + port + ' (ms)')
+    print('{0:<16}{1:>8}{2:>8}{3:>8}{4:>8}{5:>8}'.format(
+        '', 'min', 'median', 'mean', 'max', 'missed'))
+    for name, summaries in results.items():
+        for key, summary in summaries.items():
+            row = [summary.get(stat) for stat in ('min', 'median',
+                                                  'mean', 'max')]
+            row = ['-' if value is None else '{0:.2f}'.format(value * 1000)
+                   for value in row]
+            print('{0:<16}{1:>8}{2:>8}{3:>8}{4:>8}{5:>8}'.format(
+                name + ' ' + key, row[0], row[1], row[2], row[3],
+                summary['missed']))
+
+
+def main():
+    """Characterize every attached motor and print the results."""
+    from .fileio import real_robot
+    if real_robot():
+        timer = WallClock()
+    else:
+        from .virtualhardware import make_files, VirtualHardware
+        make_files()
+        timer = SimulatedClock(VirtualHardware())
+
+    for port in ('outA', 'outB', 'outC', 'outD'):
+        try:
+            motor = Motor(port)
+        except Exception:
+            # Skip ports without a motor
+            continue
+        print_results(port, characterize(motor, timer))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Module to measure how much memory the library uses.
+
+Run it as a script to print a report, on the EV3 or on a PC:
+
+    micropython -m ev3devlight.memory
+
+The report lists the heap use after importing each module, and the heap
+use of each type of device. Compare reports between releases to catch
+memory growth early.
+
+Device figures are only meaningful on the EV3. On a PC, Motor opens its
+files as unbuffered VirtualFile objects, while sensors use ordinary
+buffered files, so device types cannot be compared with each other there.
+Compare PC reports only with other PC reports.
+
+Motor figures leave out the duty_cycle_sp and position_sp files, because
+a Motor only opens those when they are first used.
+"""
+import gc
+
+try:
+    from tracemalloc import start, is_tracing, get_traced_memory
+except ImportError:
+    # MicroPython reports heap use through gc.mem_alloc instead
+    start = None
+
+# Modules in the order in which they are imported for the report
+MODULES = (
+    'ev3devlight.fileio',
+    'ev3devlight.sensors',
+    'ev3devlight.motors',
+    'ev3devlight.brick',
+)
+
+
+def heap_used():
+    """Return the number of bytes in use on the heap after a collection."""
+    gc.collect()
+    if start is None:
+        return gc.mem_alloc()
+    if not is_tracing():
+        start()
+    return get_traced_memory()[0]
+
+
+def measure(function, *args, **kwargs):
+    """Call a function. Return its result and the bytes it kept in use."""
+    before = heap_used()
+    result = function(*args, **kwargs)
+    return result, heap_used() - before
+
+
+def import_report(modules=MODULES):
+    """Import each module in turn and return (name, bytes) pairs.
+
+    Modules that were already imported count as 0 bytes.
+    """
+    return [(name, measure(__import__, name)[1]) for name in modules]
+
+
+def default_devices():
+    """Return (name, function) pairs that make one of each device.
+
+    The ports match the dummy hardware made by make_files(). On the EV3,
+    devices that are not attached are skipped by device_report. To measure
+    the devices you actually use, pass your own list to device_report.
+    """
+    from .motors import Motor, DriveBase, Mechanism
+    from .sensors import Touch, Gyro, Proximity, Remote, Analog
+
+    # The mechanism is measured without its motor
+    try:
+        mechanism_motor = Motor('outD')
+    except Exception:
+        mechanism_motor = None
+
+    devices = [
+        ('Motor', lambda: Motor('outA')),
+        ('DriveBase', lambda: DriveBase('outB', 'outC', 4.3, 12)),
+        ('Touch', lambda: Touch('in1')),
+        # Do not calibrate, since in2 might not be a gyro on the EV3
+        ('Gyro', lambda: Gyro('in2', calibrate=False)),
+        ('Proximity', lambda: Proximity('in3')),
+        ('Remote', lambda: Remote('in4')),
+        ('Analog', lambda: Analog('in4')),
+    ]
+    if mechanism_motor is not None:
+        devices.append(
+            ('Mechanism', lambda: Mechanism(mechanism_motor,
+                                            {'reset': 0, 'up': 90}, 100,
+                                            reset_immediately=False)))
+    return devices
+
+
+def device_report(devices=None):
+    """Make each device and return (name, bytes) pairs.
+
+    All devices are kept until the report is done, so each measurement
+    only includes the memory of the device itself. Devices that cannot be
+    made, for example because they are not attached, are left out.
+    """
+    if devices is None:
+        devices = default_devices()
+    kept = []
+    report = []
+    for name, make_device in devices:
+        try:
+            device, used = measure(make_device)
+        except Exception:
+            # Skip devices that are not attached
+            continue
+        kept.append(device)
+        report.append((name, used))
+    return report
+
+
+def print_report():
+    """Print heap use per imported module and per device."""
+    # Import first, so that module memory is not counted for devices
+    imports = import_report()
+
+    # On a PC, the devices need dummy hardware files
+    from .fileio import ON_ROBOT
+    if not ON_ROBOT:
+        from .virtualhardware import make_files
+        make_files()
+
+    print('Heap use after import (bytes)')
+    for name, used in imports:
+        print('{0:<28}{1:>8}'.format(name, used))
+    if ON_ROBOT:
+        print('Heap use per device (bytes)')
+    else:
+        print('Heap use per device (bytes, PC stand-in files)')
+    for name, used in device_report():
+        print('{0:<28}{1:>8}'.format(name, used))
+
+
+if __name__ == '__main__':
+    print_report()
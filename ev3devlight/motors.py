@@ -2,7 +2,7 @@
 
 from time import sleep
 from .fileio import (read_int, read_str, write_int, write_str,
-                     get_sensor_or_motor_path, write_duty)
+                     get_sensor_or_motor_path, write_duty, open_device_file)
 
 
 class Motor():
@@ -36,6 +36,13 @@ class Motor():
     #      \_________ /
     #
     # Here the gear ratio is 12t/36t = 1/3.
+
+    # Fixed attributes instead of a dictionary, to save memory
+    __slots__ = ('port', 'path', 'position_file', 'speed_file',
+                 'speed_sp_file', 'duty_sp_file', 'position_sp_file',
+                 'command_file', 'state_file', 'gear_ratio', 'tolerance',
+                 'RATED_MOTOR_MAX_SPEED', 'MAX_SPEED')
+
     def __init__(
             self,
             port,
@@ -48,14 +55,16 @@ class Motor():
         self.path = get_sensor_or_motor_path('tacho-motor', self.port)
 
         # Open files for fast reading and writing
-        self.position_file = open(self.path + '/position', 'r+b')
-        self.speed_file = open(self.path + '/speed', 'rb')
-        self.speed_sp_file = open(self.path + '/speed_sp', 'w')
-        self.duty_sp_file = open(self.path + '/duty_cycle_sp', 'w')
-        self.position_sp_file = open(self.path + '/position_sp', 'w')
-        self.polarity_file = open(self.path + '/polarity', 'w')
-        self.command_file = open(self.path + '/command', 'w')
-        self.state_file = open(self.path + '/state', 'rb')
+        path = self.path + '/'
+        self.position_file = open_device_file(path + 'position', 'r+b')
+        self.speed_file = open_device_file(path + 'speed', 'rb')
+        self.speed_sp_file = open_device_file(path + 'speed_sp', 'w')
+        self.command_file = open_device_file(path + 'command', 'w')
+        self.state_file = open_device_file(path + 'state', 'rb')
+
+        # Files that not every program needs are opened on first use
+        self.duty_sp_file = None
+        self.position_sp_file = None
 
         # Reset any prior settings
         self.reset_all_settings()
@@ -111,6 +120,9 @@ class Motor():
 
     def duty(self, duty):
         """Set the duty cycle."""
+        if self.duty_sp_file is None:
+            self.duty_sp_file = open_device_file(self.path + '/duty_cycle_sp',
+                                                 'w')
         write_duty(self.duty_sp_file, duty)
 
     def activate_duty_mode(self):
@@ -135,13 +147,18 @@ class Motor():
         while not self.stalled:
             sleep(0.001)
 
+    def set_polarity(self, polarity):
+        """Write the polarity string. The file is only opened briefly."""
+        with open(self.path + '/polarity', 'w') as polarity_file:
+            write_str(polarity_file, polarity)
+
     def set_polarity_normal(self):
         """Set the motor polarity as standard."""
-        write_str(self.polarity_file, 'normal')
+        self.set_polarity('normal')
 
     def set_polarity_inversed(self):
         """Set the motor polarity as the opposite of standard."""
-        write_str(self.polarity_file, 'inversed')
+        self.set_polarity('inversed')
 
     @property
     def state(self):
@@ -160,6 +177,9 @@ class Motor():
     def go_to(self, target, speed, wait=True):
         """Go to a target at a desired speed."""
         if not self.running and not self.at_target(target):
+            if self.position_sp_file is None:
+                self.position_sp_file = open_device_file(
+                    self.path + '/position_sp', 'w')
             # Write target
             write_int(self.position_sp_file, target*self.gear_ratio)
             # Write speed setpoint
@@ -176,6 +196,9 @@ class Motor():
 class DriveBase():
     """Control two motors to drive a skid steering robot."""
 
+    __slots__ = ('max_speed', 'max_turn_rate', 'positive_turn_is_clockwise',
+                 'wheel_factor', 'base_factor', 'left_motor', 'right_motor')
+
     def __init__(
             self,
             left_port,
@@ -250,6 +273,9 @@ class DriveBase():
 class Mechanism():
     """Mechanisms with a fixed stop and fixed targets."""
 
+    __slots__ = ('reset_forward', 'motor', 'targets', 'default_speed',
+                 'touch_sensor')
+
     def __init__(
             self,
             motor,
@@ -7,6 +7,10 @@ from time import sleep
 class Sensor(object):
     """Generic sensor class."""
 
+    # Fixed attributes instead of a dictionary, to save memory. Subclasses
+    # list only the attributes they add.
+    __slots__ = ('port', 'path', 'value0_file', 'pause_time')
+
     def __init__(self, port):
         """Initialize touch sensor."""
         self.port = port
@@ -45,6 +49,8 @@ class Sensor(object):
 class Touch(Sensor):
     """Configure Touch Sensor."""
 
+    __slots__ = ()
+
     @property
     def pressed(self):
         """Return True if sensor is pressed, return False if released."""
@@ -77,6 +83,8 @@ class Touch(Sensor):
 class Gyro(Sensor):
     """Configure a Gyro sensor."""
 
+    __slots__ = ('angle_file', 'rate_file')
+
     def __init__(self, port, read_rate=True, read_angle=False, calibrate=True):
         """Initialize sensor and set mode."""
         # Basic sensor initialization
@@ -90,17 +98,17 @@ class Gyro(Sensor):
             self.calibrate()
 
         # Set mode based on initialization arguments.
-        # Then open relevant sensor files for fast reading.
+        # Then reuse the value0 file or open value1 for fast reading.
         if read_rate and read_angle:
             self.mode = 'GYRO-G&A'
-            self.angle_file = self.open('value0')
+            self.angle_file = self.value0_file
             self.rate_file = self.open('value1')
         elif read_angle:
             self.mode = 'GYRO-ANG'
-            self.angle_file = self.open('value0')
+            self.angle_file = self.value0_file
         elif read_rate:
             self.mode = 'GYRO-RATE'
-            self.rate_file = self.open('value0')
+            self.rate_file = self.value0_file
 
     def calibrate(self):
         """Reset angle and rate bias to zero."""
@@ -125,6 +133,8 @@ class Gyro(Sensor):
 class Proximity(Sensor):
     """Configure an IR sensor in proximity mode."""
 
+    __slots__ = ('threshold',)
+
     def __init__(self, port, threshold=50):
         """Initialize sensor and set mode."""
         Sensor.__init__(self, port)
@@ -153,8 +163,10 @@ class Proximity(Sensor):
 class Remote(Sensor):
     """Configure an IR sensor to read remote button status."""
 
-    # Numbered list of possible button presses
-    buttons = [
+    __slots__ = ()
+
+    # Numbered tuple of possible button presses
+    buttons = (
         'NONE',
         'LEFT_UP',
         'LEFT_DOWN',
@@ -167,7 +179,7 @@ class Remote(Sensor):
         'BEACON',
         'BOTH_LEFT',
         'BOTH_RIGHT'
-    ]
+    )
 
     def __init__(self, port):
         """Initialize sensor and set mode."""
@@ -187,6 +199,8 @@ class Remote(Sensor):
 class Analog(Sensor):
     """Configure an Analog Sensor."""
 
+    __slots__ = ('scaling',)
+
     def __init__(self, port, scaling=1):
         """Initialize analog sensor."""
         self.scaling = scaling
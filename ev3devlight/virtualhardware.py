@@ -1,4 +1,6 @@
-"""Module to generate dummy EV3 hardware files."""
+"""Module to generate and simulate dummy EV3 hardware files."""
+from os import listdir
+from .fileio import VirtualFile, read_int, read_str
 
 
 def make_files():
@@ -93,4 +95,141 @@ def make_files():
     write_file_contents('hardware/power_supply/lego-ev3-battery/',
                         battery_files)
 
+    # Framebuffer geometry, the same as the EV3 screen on ev3dev-stretch
+    width, height, bits_per_pixel = 178, 128, 32
+    stride = width * bits_per_pixel // 8
+    graphics_files = {
+        'virtual_size': str(width) + ',' + str(height),
+        'bits_per_pixel': str(bits_per_pixel),
+        'stride': str(stride)
+    }
+    write_file_contents('hardware/graphics/fb0/', graphics_files)
+
+    # A plain file of the same size stands in for the framebuffer device
+    with open('hardware/fb0', 'wb') as framebuffer_file:
+        framebuffer_file.write(bytes(stride * height))
+
     # TODO: Populate dummy files for power supply, leds, buttons, etc
+
+
+class VirtualMotor():
+    """Simulate one tacho-motor by updating its dummy files.
+
+    The motor speed follows the commanded speed as a first order system
+    with the given time constant. The reported speed is the average over
+    the last speed_window seconds, like the estimate of a real motor.
+
+    Polarity is ignored, since inverting it has no visible effect
+    without a model of the robot.
+    """
+
+    def __init__(self, path, step_time, time_constant=0.05,
+                 speed_window=0.03):
+        """Open the motor files and start at rest at position 0."""
+        self.step_time = step_time
+        self.time_constant = time_constant
+
+        # Open the same files that a Motor writes to and reads from
+        path = path + '/'
+        self.command_file = VirtualFile(path + 'command')
+        self.speed_sp_file = VirtualFile(path + 'speed_sp')
+        self.duty_sp_file = VirtualFile(path + 'duty_cycle_sp')
+        self.position_sp_file = VirtualFile(path + 'position_sp')
+        self.position_file = VirtualFile(path + 'position')
+        self.speed_file = VirtualFile(path + 'speed')
+        self.state_file = VirtualFile(path + 'state')
+        with open(path + 'max_speed', 'rb') as f:
+            self.max_speed = read_int(f)
+
+        # Physical state in motor degrees and degrees per second
+        self.mode = 'stop'
+        self.position = 0.0
+        self.speed = 0.0
+        self.history = [0.0] * max(1, round(speed_window / step_time))
+        self.write_outputs()
+
+    def reset(self):
+        """Stop the motor and set its position to 0."""
+        self.mode = 'stop'
+        self.position = 0.0
+        self.speed = 0.0
+        self.history = [0.0] * len(self.history)
+
+    def target_speed(self):
+        """Return the speed that the current command asks for."""
+        if self.mode == 'run-forever':
+            target = read_int(self.speed_sp_file)
+        elif self.mode == 'run-direct':
+            target = read_int(self.duty_sp_file) * self.max_speed / 100
+        elif self.mode == 'run-to-abs-pos':
+            # Slow down proportionally when getting close to the target
+            error = read_int(self.position_sp_file) - self.position
+            if abs(error) < 1:
+                self.mode = 'stop'
+                return 0
+            gain = 1 / (4 * self.time_constant)
+            limit = abs(read_int(self.speed_sp_file))
+            target = max(min(gain * error, limit), -limit)
+        else:
+            target = 0
+        return max(min(target, self.max_speed), -self.max_speed)
+
+    def step(self):
+        """Advance the motor by one time step."""
+        # Process a new command, if one was written
+        command = read_str(self.command_file)
+        if command:
+            self.command_file.write('')
+            if command == 'reset':
+                self.reset()
+            elif command in ('run-forever', 'run-direct',
+                             'run-to-abs-pos', 'stop'):
+                self.mode = command
+
+        # Use a position written by the program, if there is one
+        if read_str(self.position_file) != self.position_text:
+            self.position = read_int(self.position_file)
+            self.history = [self.position] * len(self.history)
+
+        # Let the speed approach the target speed
+        alpha = min(self.step_time / self.time_constant, 1)
+        self.speed += alpha * (self.target_speed() - self.speed)
+        self.position += self.speed * self.step_time
+        self.write_outputs()
+
+    def write_outputs(self):
+        """Write position, speed estimate and state for the program to read."""
+        # Estimate speed from the position change over the history window
+        estimate = (self.position - self.history.pop(0)) / \
+            (len(self.history) + 1) / self.step_time
+        self.history.append(self.position)
+
+        self.position_text = str(int(round(self.position)))
+        self.position_file.write(self.position_text)
+        self.speed_file.write(str(int(round(estimate))))
+        self.state_file.write('running' if self.mode != 'stop' else '')
+
+
+class VirtualHardware():
+    """Step all motors made by make_files() forward in time."""
+
+    def __init__(self, step_time=0.01, **motor_options):
+        """Find the dummy motors. Extra options go to each VirtualMotor."""
+        self.step_time = step_time
+        self.steps = 0
+        base_dir = 'hardware/tacho-motor/'
+        self.motors = [
+            VirtualMotor(base_dir + device_dir, step_time, **motor_options)
+            for device_dir in sorted(listdir(base_dir))
+        ]
+
+    @property
+    def time(self):
+        """Return the simulated time in seconds."""
+        return self.steps * self.step_time
+
+    def step(self):
+        """Advance all motors by one time step."""
+        for motor in self.motors:
+            motor.step()
+        self.steps += 1
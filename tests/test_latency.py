@@ -0,0 +1,37 @@
+"""Tests for the motor latency characterization on simulated hardware."""
+from ev3devlight.latency import SimulatedClock, characterize, statistics
+from ev3devlight.motors import Motor
+from ev3devlight.virtualhardware import make_files, VirtualHardware
+
+
+def run_characterize(speed_window):
+    """Characterize outA on fresh virtual hardware in the current folder."""
+    make_files()
+    timer = SimulatedClock(VirtualHardware(speed_window=speed_window))
+    return characterize(Motor('outA'), timer, trials=2)
+
+
+def test_characterize_measures_every_trial(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    results = run_characterize(0.03)
+    for mode in ('run', 'duty'):
+        for key in ('position', 'speed', 'speed_lag'):
+            assert results[mode][key]['missed'] == 0
+            assert results[mode][key]['count'] == 2
+
+
+def test_speed_lag_grows_with_speed_window(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    short = run_characterize(0.01)
+    long = run_characterize(0.1)
+    for mode in ('run', 'duty'):
+        assert (long[mode]['speed_lag']['median'] >
+                short[mode]['speed_lag']['median'])
+
+
+def test_statistics_median():
+    assert statistics([3, 1, 2])['median'] == 2
+    assert statistics([4, 1, 3, 2])['median'] == 2.5
+    summary = statistics([1, None])
+    assert summary['count'] == 1
+    assert summary['missed'] == 1